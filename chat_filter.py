@@ -3,17 +3,305 @@ Chat Message Filter Module
 A comprehensive text filtering system that detects and censors inappropriate content.
 """
 
+import bisect
+import functools
+import heapq
+import itertools
 import json
+import marshal
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Set, Optional, Tuple
+import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, FrozenSet, Iterator, Set, Optional, Tuple
 from enum import Enum
 import logging
 
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Batches larger than this are spread over a process pool. The in-process
+# single-pass scan takes ~17 us per message, a warm pool adds ~1 ms per call
+# and starting the forkserver pool ~85 ms, so only batches of several
+# thousand messages gain from it
+_PARALLEL_BATCH_THRESHOLD = 5000
+
+# Pool workers are never forked from a possibly multi-threaded server process
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Suffix of the parsed word list cached next to a curse words file
+_WORD_CACHE_SUFFIX = '.cache.marshal'
+
+# The group makes split() keep the words: [separator, word, separator, ..., separator]
+# A maximal run of word characters is always bounded, so no \b assertions are needed
+_WORD_RE = re.compile(r'(\w+)')
+
+
+def _read_word_cache(cache_path: str, cache_key: Tuple[int, int]) -> Optional[Set[str]]:
+    """Return the cached word set, or None if the cache is missing, stale or malformed"""
+    # marshal, unlike pickle, cannot run code while loading a tampered file
+    try:
+        with open(cache_path, 'rb') as file:
+            cached = marshal.load(file)
+    except Exception:
+        return None
+    
+    if not (isinstance(cached, tuple) and len(cached) == 2 and cached[0] == cache_key
+            and isinstance(cached[1], list) and all(isinstance(word, str) for word in cached[1])):
+        return None
+    return set(cached[1])
+
+
+def _write_word_cache(cache_path: str, cache_key: Tuple[int, int], words: Set[str]) -> None:
+    """Save a parsed word set, failures only cost the next load a JSON parse"""
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as file:
+            marshal.dump((cache_key, sorted(words)), file)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not write curse word cache %s: %s", cache_path, e)
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+# Code points below this (Latin, Greek, Cyrillic, ...) are memoized in the tables
+_NORMALIZATION_MEMO_LIMIT = 0x800
+
+
+class _NormalizationTable(dict):
+    """
+    str.translate table that lowercases text while normalizing it.
+    
+    Characters without an explicit entry are lowercased and the result is
+    mapped through the table again; anything still unmapped is deleted.
+    The outcome is stored for code points below _NORMALIZATION_MEMO_LIMIT,
+    so common scripts only take this path once while arbitrary input
+    cannot grow the shared tables without bound.
+    """
+    
+    _ascii: Optional[Tuple[bytes, bytes]] = None
+
+    def __missing__(self, key: int) -> Optional[str]:
+        char = chr(key)
+        lowered = char.lower()
+        if lowered == char:
+            result = None
+        else:
+            mapped = [self[ord(c)] for c in lowered]
+            result = ''.join(chr(c) if isinstance(c, int) else c
+                             for c in mapped if c is not None) or None
+        
+        if key < _NORMALIZATION_MEMO_LIMIT:
+            self[key] = result
+        return result
+    
+    def normalize(self, text: str) -> str:
+        """Translate text, using bytes.translate when it is pure ASCII"""
+        if not text.isascii():
+            return text.translate(self)
+        
+        if self._ascii is None:
+            table = bytearray(range(256))
+            delete = bytearray()
+            for code in range(128):
+                mapped = self[code]
+                if mapped is None:
+                    delete.append(code)
+                else:
+                    table[code] = mapped if isinstance(mapped, int) else ord(mapped)
+            self._ascii = (bytes(table), bytes(delete))
+        
+        return text.encode('ascii').translate(*self._ascii).decode('ascii')
+
+
+# Text is lowercased and reduced to ASCII letters, spaces separate the words
+_STRICT_TABLE = _NormalizationTable(str.maketrans(string.ascii_letters + ' ',
+                                                  string.ascii_lowercase * 2 + ' '))
+
+# Same as above, but leet speak characters are mapped back to letters first
+_LEET_TABLE = _NormalizationTable(_STRICT_TABLE)
+_LEET_TABLE.update(str.maketrans('yY13457@$!', 'uuieastasi'))
+
+
 class FilterLevel(Enum):
     """Enumeration for different filtering levels"""
     STRICT = "strict"
     MODERATE = "moderate"
     LENIENT = "lenient"
+    
+    # Members are singletons used as dict and cache keys on the hot path;
+    # identity hashing is done in C instead of Enum's hash of the name
+    __hash__ = object.__hash__
+
+class _TrieNode:
+    """Node of the pure Python Aho-Corasick trie"""
+    __slots__ = ('children', 'fail', 'value', 'output', 'index')
+    
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.fail: Optional['_TrieNode'] = None
+        self.value = None
+        self.output: List = []
+        self.index = 0
+
+
+class _Trie:
+    """
+    Pure Python Aho-Corasick automaton used when pyahocorasick is not installed.
+    
+    Implements the subset of ahocorasick.Automaton the filter relies on:
+    add_word, make_automaton, iter and len.
+    """
+    
+    def __init__(self):
+        self.root = _TrieNode()
+        self.size = 0
+        
+        # Flattened automaton: per-state transitions and output values
+        self.goto: List[Dict[str, int]] = []
+        self.outputs: List[List] = []
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def add_word(self, key: str, value) -> bool:
+        """Insert a word, returns True if it was not in the trie yet"""
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        
+        is_new = node.value is None
+        if is_new:
+            self.size += 1
+        node.value = value
+        return is_new
+    
+    def make_automaton(self) -> None:
+        """Compute failure links, then flatten the trie into a transition table"""
+        root = self.root
+        root.fail = root
+        nodes = [root]
+        for node in nodes:
+            for char, child in node.children.items():
+                fail = node.fail
+                while fail is not root and char not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(char, root) if node is not root else root
+                child.output = [child.value] if child.value is not None else []
+                child.output += child.fail.output
+                nodes.append(child)
+        
+        # Each state's row starts from its failure state's row, which comes
+        # earlier in breadth-first order, so the scan never follows fail links
+        for index, node in enumerate(nodes):
+            node.index = index
+        self.goto = []
+        self.outputs = []
+        for node in nodes:
+            row = dict(self.goto[node.fail.index]) if node is not root else {}
+            row.update((char, child.index) for char, child in node.children.items())
+            self.goto.append(row)
+            self.outputs.append(node.output)
+    
+    def iter(self, text: str):
+        """Yield (end_index, value) for every word occurrence in text"""
+        goto = self.goto
+        outputs = self.outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                for value in outputs[state]:
+                    yield index, value
+
+
+class _AlternationMatcher:
+    """
+    Regex alternation matcher for small word lists without pyahocorasick.
+    
+    Same interface as _Trie, but the scan runs in the C regex engine. Keys
+    are tried at every position through a lookahead, so overlapping keys
+    are found, but only one key (the longest) per start position. This is
+    enough for the space delimited keys of the filter.
+    """
+    
+    def __init__(self):
+        self.words: Dict[str, int] = {}
+        self.pattern: Optional[re.Pattern] = None
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def add_word(self, key: str, value) -> bool:
+        """Insert a word, returns True if it was not added yet"""
+        is_new = key not in self.words
+        self.words[key] = value
+        return is_new
+    
+    def make_automaton(self) -> None:
+        """Compile the keys into one alternation, longest first"""
+        keys = sorted(self.words, key=len, reverse=True)
+        self.pattern = re.compile('(?=(' + '|'.join(map(re.escape, keys)) + '))')
+    
+    def iter(self, text: str):
+        """Yield (end_index, value) for every word occurrence in text"""
+        words = self.words
+        for match in self.pattern.finditer(text):
+            yield match.end(1) - 1, words[match.group(1)]
+
+
+# Word lists up to this size use _AlternationMatcher instead of _Trie
+_ALTERNATION_MAX_WORDS = 64
+
+
+# Normalizations tried for each word, a word is filtered if any of them matches
+_LEVEL_TABLES = {
+    FilterLevel.STRICT: (_STRICT_TABLE, _LEET_TABLE),
+    FilterLevel.MODERATE: (_STRICT_TABLE, _LEET_TABLE),
+    FilterLevel.LENIENT: (_STRICT_TABLE,),
+}
+
+# Normalizations for filters created with normalize_leet=False
+_PLAIN_LEVEL_TABLES = {level: (_STRICT_TABLE,) for level in _LEVEL_TABLES}
+
+
+@functools.lru_cache(maxsize=4)
+def _build_automaton(words: FrozenSet[str], factory):
+    """
+    Build the automaton for a word list, or None if no word can ever match.
+    
+    Automatons are never modified after they are built, so filters with the
+    same word list share one. A filter whose words change builds a new one.
+    """
+    automaton = factory()
+    for word in words:
+        # Normalized text only contains ASCII letters, nothing else can match
+        if word.isascii() and word.isalpha():
+            # Space delimited keys only match whole words of the scanned text
+            automaton.add_word(f' {word} ', len(word) + 2)
+    
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
 
 class ChatMessageFilter:
     """
@@ -22,20 +310,45 @@ class ChatMessageFilter:
     """
     
     def __init__(self, curse_words_file: str = "curse_words.json", 
-                 filter_level: FilterLevel = FilterLevel.MODERATE):
+                 filter_level: FilterLevel = FilterLevel.MODERATE,
+                 normalize_leet: bool = True):
         """
         Initialize the chat filter with curse words and settings.
         
         Args:
             curse_words_file: Path to JSON file containing curse words
             filter_level: Strictness level for filtering
+            normalize_leet: Whether strict and moderate levels also match
+                leet speak variations (e.g. "5uka")
         """
         self.filter_level = filter_level
+        self.normalize_leet = normalize_leet
+        self._level_tables = _LEVEL_TABLES if normalize_leet else _PLAIN_LEVEL_TABLES
         self.curse_words: Set[str] = set()
         self.replacement_char = "*"
         self.max_message_length = 1000
         self.min_message_length = 1
         
+        # Read-only snapshot of curse_words probed on the hot path
+        self._curse_frozen: FrozenSet[str] = frozenset()
+        
+        # (word snapshot, automaton built from it), rebuilt lazily once
+        # _curse_frozen is replaced; one attribute so both always match
+        self._automaton_state: Optional[Tuple[FrozenSet[str], object]] = None
+        
+        # Replacement strings indexed by length, per replacement character
+        self._stars: Dict[str, List[str]] = {}
+        
+        # Memoized per-word decisions and per-message matches
+        self._make_caches()
+        
+        # Process pool for large batches, started on first use
+        self._pool: Optional[ProcessPoolExecutor] = None
+        
+        # Bumped on every curse word change, sorted list cached as (version, list)
+        self.curse_words_version = 0
+        self._sorted_curse_words: Optional[Tuple[int, List[str]]] = None
+        
         # Statistics tracking
         self.total_messages_processed = 0
         self.total_words_filtered = 0
@@ -43,39 +356,21 @@ class ChatMessageFilter:
         try:
             self._load_curse_words(curse_words_file)
         except Exception as e:
-            logging.warning(f"Failed to load curse words file: {e}")
+            logger.warning("Failed to load curse words file: %s", e)
             # DO NOT load default words - keep empty if file fails
             print(f"⚠️  Warning: No curse words loaded. Filter will not block anything.")
     
     def _load_curse_words(self, file_path: str) -> None:
         """Load curse words from JSON file - handles multiple formats"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                
-                # Handle different JSON formats
-                if isinstance(data, list):
-                    # Format: ["word1", "word2", ...]
-                    self.curse_words = set(str(word).lower().strip() for word in data if word)
-                elif isinstance(data, dict):
-                    # Format: {"words": [...]} or {"curse": [...]} or {"word1": "value", ...}
-                    # Try common keys first
-                    for key in ['words', 'curse', 'curse_words', 'bad_words', 'profanity']:
-                        if key in data and isinstance(data[key], list):
-                            self.curse_words = set(str(word).lower().strip() for word in data[key] if word)
-                            break
-                    else:
-                        # If no common key found, use dictionary keys as words
-                        self.curse_words = set(str(key).lower().strip() for key in data.keys() if key)
-                else:
-                    raise ValueError("Invalid JSON format - must be list or dict")
-                
-                if len(self.curse_words) == 0:
-                    raise ValueError("No curse words found in file")
-                
-                print(f"✅ Loaded {len(self.curse_words)} curse words from {file_path}")
-                print(f"   First few words: {sorted(list(self.curse_words))[:5]}...")  # Show first 5
-                
+            stat = os.stat(file_path)
+            words = type(self)._load_state(file_path, (stat.st_mtime_ns, stat.st_size))
+            self.curse_words = set(words)
+            self._invalidate_caches()
+            
+            print(f"✅ Loaded {len(self.curse_words)} curse words from {file_path}")
+            print(f"   First few words: {heapq.nsmallest(5, self.curse_words)}...")  # Show first 5
+            
         except FileNotFoundError:
             raise FileNotFoundError(f"Curse words file not found: {file_path}")
         except json.JSONDecodeError as e:
@@ -83,12 +378,96 @@ class ChatMessageFilter:
         except Exception as e:
             raise Exception(f"Error loading curse words: {e}")
     
+    @classmethod
+    @functools.lru_cache(maxsize=16)
+    def _load_state(cls, file_path: str, cache_key: Tuple[int, int]) -> FrozenSet[str]:
+        """
+        Parse a curse words file, shared by all instances loading the same file.
+        
+        Cached per (mtime, size) of the file, so instances created while the
+        file is unchanged skip parsing entirely. Parsed words are also cached
+        next to the file, which lets new processes skip the JSON parse.
+        """
+        cache_path = file_path + _WORD_CACHE_SUFFIX
+        words = _read_word_cache(cache_path, cache_key)
+        
+        if words is None:
+            # Both parsers decode UTF-8 bytes themselves, no text layer needed
+            with open(file_path, 'rb') as file:
+                raw = file.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        
+            # Handle different JSON formats
+            if isinstance(data, list):
+                # Format: ["word1", "word2", ...]
+                words = set(str(word).lower().strip() for word in data if word)
+            elif isinstance(data, dict):
+                # Format: {"words": [...]} or {"curse": [...]} or {"word1": "value", ...}
+                # Try common keys first
+                for key in ['words', 'curse', 'curse_words', 'bad_words', 'profanity']:
+                    if key in data and isinstance(data[key], list):
+                        words = set(str(word).lower().strip() for word in data[key] if word)
+                        break
+                else:
+                    # If no common key found, use dictionary keys as words
+                    words = set(str(key).lower().strip() for key in data.keys() if key)
+            else:
+                raise ValueError("Invalid JSON format - must be list or dict")
+            
+            if len(words) == 0:
+                raise ValueError("No curse words found in file")
+            
+            _write_word_cache(cache_path, cache_key, words)
+        
+        # Also applies to cached lists, a cache never stands in for an empty file
+        if len(words) == 0:
+            raise ValueError("No curse words found in file")
+        
+        return frozenset(words)
+    
     def _load_default_words(self) -> None:
         """Load a default set of curse words if file loading fails"""
         # REMOVED - No default words will be loaded
         # User must provide their own curse_words.json
         pass
     
+    def __getstate__(self) -> Dict:
+        """Pickle support, caches and the process pool are not transferred"""
+        state = self.__dict__.copy()
+        del state['_should_filter_word_cached']
+        del state['_match_joined_cached']
+        # Module level tables are looked up again instead of being copied
+        del state['_level_tables']
+        state['_automaton_state'] = None
+        state['_pool'] = None
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._level_tables = _LEVEL_TABLES if self.normalize_leet else _PLAIN_LEVEL_TABLES
+        self._make_caches()
+    
+    def _make_caches(self) -> None:
+        """Create the per-instance LRU caches"""
+        self._should_filter_word_cached = functools.lru_cache(maxsize=65536)(self._should_filter_word)
+        self._match_joined_cached = functools.lru_cache(maxsize=4096)(self._match_joined)
+    
+    def _invalidate_caches(self) -> None:
+        """Drop everything derived from the curse word list"""
+        self._curse_frozen = frozenset(self.curse_words)
+        self._sorted_curse_words = None
+        self._stars = {}
+        self._should_filter_word_cached.cache_clear()
+        self._match_joined_cached.cache_clear()
+        
+        # Bumped last: a scan that sees the new version also sees the new words
+        self.curse_words_version += 1
+        
+        # Pool workers hold a copy of the old word list
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
     def add_curse_word(self, word: str) -> bool:
         """
         Add a new curse word to the filter.
@@ -107,6 +486,7 @@ class ChatMessageFilter:
             return False
         
         self.curse_words.add(word_lower)
+        self._invalidate_caches()
         return True
     
     def remove_curse_word(self, word: str) -> bool:
@@ -125,6 +505,7 @@ class ChatMessageFilter:
         word_lower = word.lower().strip()
         if word_lower in self.curse_words:
             self.curse_words.remove(word_lower)
+            self._invalidate_caches()
             return True
         return False
     
@@ -140,48 +521,183 @@ class ChatMessageFilter:
             raise ValueError("Level must be a FilterLevel enum")
         self.filter_level = level
     
-    def _normalize_word(self, word: str) -> str:
-        """Normalize word by removing special characters and digits"""
-        # Remove special characters but keep letters
-        normalized = re.sub(r'[^a-zA-Z]', '', word.lower())
-        return normalized
+    def _should_filter_word(self, word: str, level: FilterLevel, version: int) -> bool:
+        """
+        Determine if a word should be filtered at the given level.
+        
+        Used through _should_filter_word_cached; the level and curse word
+        version are part of the key so a racing settings or word list change
+        can never leave a stale decision behind.
+        """
+        if not word:
+            return False
+        
+        # The tables keep spaces as word separators for the message scan,
+        # a single word is checked with all of them removed
+        return any(table.normalize(word).replace(' ', '') in self._curse_frozen
+                   for table in self._level_tables[level])
+    
+    def _get_automaton(self):
+        """Return the curse word automaton, rebuilding it if the word list changed"""
+        words = self._curse_frozen
+        state = self._automaton_state
+        if state is not None and state[0] is words:
+            return state[1]
+        
+        # Built from the snapshot read above; if the words change meanwhile,
+        # the stored snapshot no longer matches and the next call rebuilds
+        if ahocorasick is not None:
+            factory = ahocorasick.Automaton
+        elif len(words) <= _ALTERNATION_MAX_WORDS:
+            factory = _AlternationMatcher
+        else:
+            factory = _Trie
+        automaton = _build_automaton(words, factory)
+        self._automaton_state = (words, automaton)
+        return automaton
     
-    def _detect_variations(self, word: str) -> bool:
+    def _replacement_strings(self, replacement_char: str) -> List[str]:
         """
-        Detect common variations of curse words (leet speak, character substitution)
+        Replacement strings indexed by length, up to the longest curse word.
+        
+        Longer words (e.g. with characters dropped by normalization) are not
+        covered and have to be built by the caller.
         """
-        # Common character substitutions
-        substitutions = {
-            'y': 'u', '1': 'i', '3': 'e', '4': 'a', '5': 's', 
-            '7': 't', '@': 'a', '$': 's', '!': 'i'
-        }
+        stars = self._stars.get(replacement_char)
+        if stars is None:
+            if len(self._stars) >= 16:
+                self._stars.clear()
+            longest = max(map(len, self._curse_frozen), default=0)
+            stars = [replacement_char * length for length in range(max(longest, 3) + 1)]
+            self._stars[replacement_char] = stars
+        return stars
+    
+    def _iter_matches(self, words: List[str], level: FilterLevel) -> Iterator[int]:
+        """Find which words of a tokenized message should be filtered"""
+        return self._iter_joined_matches(' '.join(words), level)
+    
+    def _iter_joined_matches(self, joined: str, level: FilterLevel) -> Iterator[int]:
+        """
+        Find which words of a tokenized message should be filtered.
         
-        # Replace common substitutions
-        normalized = word.lower()
-        for digit, letter in substitutions.items():
-            normalized = normalized.replace(digit, letter)
+        All words are normalized in a single pass and scanned at once with the
+        Aho-Corasick automaton. Its keys are delimited by spaces, so the
+        automaton itself rejects hits inside longer words and only whole word
+        matches reach Python. Matches are produced lazily so callers can stop
+        at the first one.
         
-        # Remove special characters
-        normalized = self._normalize_word(normalized)
+        Args:
+            joined: Words of the message as returned by the tokenizer,
+                joined with single spaces
+            level: Filter level deciding which normalizations are tried
+            
+        Yields:
+            Indices of the words to filter, possibly repeated
+        """
+        automaton = self._get_automaton()
+        if automaton is None or not joined:
+            return
+        
+        for table in self._level_tables[level]:
+            normalized = f' {table.normalize(joined)} '
+            index = 0
+            position = 0
+            # Hits come in text order, count the separators since the previous one
+            for end, length in automaton.iter(normalized):
+                start = end - length + 1
+                index += normalized.count(' ', position, start)
+                position = start
+                yield index
+    
+    def _has_any_bad_word(self, message: str) -> bool:
+        """Check a message for inappropriate words, stopping at the first one"""
+        words = _WORD_RE.findall(message)
+        return next(self._iter_matches(words, self.filter_level), None) is not None
+    
+    def _match_joined(self, joined: str, level: FilterLevel, version: int) -> Tuple[int, ...]:
+        """
+        Sorted indices of the words to filter in a space joined word list.
         
-        return normalized in self.curse_words
+        Used through _match_joined_cached, so repeated messages skip the scan.
+        Only the word text and the resulting indices are kept per entry. The
+        curse word version is only part of the key: a scan racing with a
+        word list change may store a stale result, but only under the old
+        version, which is never looked up again.
+        """
+        return tuple(sorted(set(self._iter_joined_matches(joined, level))))
     
-    def _should_filter_word(self, word: str) -> bool:
-        """Determine if a word should be filtered based on current settings"""
-        if not word:
-            return False
+    def _scan(self, message: str, level: FilterLevel, replacement_char: str,
+              preserve_length: bool = True) -> Tuple[str, List[str], int, int]:
+        """
+        Tokenize, detect and censor a message in a single pass.
         
-        word_clean = self._normalize_word(word)
+        Args:
+            message: The message to scan
+            level: Filter level to apply
+            replacement_char: Character used for replacement
+            preserve_length: Whether to preserve original word length
+            
+        Returns:
+            Tuple of (filtered message, inappropriate words, total words,
+            filtered words count)
+        """
+        parts = _WORD_RE.split(message)
+        words = parts[1::2]
+        joined = ' '.join(words)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking message words: %s", words)
+            logger.debug("Against curse words: %s", self.curse_words)
+        
+        # Oversized input (detect_inappropriate_words has no length limit) is not cached
+        if len(message) <= self.max_message_length:
+            matches = self._match_joined_cached(joined, level, self.curse_words_version)
+        else:
+            matches = self._match_joined(joined, level, self.curse_words_version)
+        inappropriate_words = [words[i] for i in matches]
+        logger.debug("Found inappropriate: %s", inappropriate_words)
+        
+        if not matches:
+            return message, inappropriate_words, len(words), 0
+        
+        stars = self._replacement_strings(replacement_char)
+        for index in matches:
+            length = len(words[index]) if preserve_length else 3
+            parts[2 * index + 1] = (stars[length] if length < len(stars)
+                                    else replacement_char * length)
+        
+        return ''.join(parts), inappropriate_words, len(words), len(matches)
+    
+    def _process(self, message: str, preserve_length: bool = True,
+                 level: Optional[FilterLevel] = None,
+                 replacement_char: Optional[str] = None) -> Tuple[str, List[str], int, int]:
+        """Validate and scan a message, updating the filtering statistics"""
+        if level is None:
+            level = self.filter_level
+        elif level not in _LEVEL_TABLES:
+            raise ValueError("Level must be a FilterLevel enum")
         
-        # Direct match
-        if word_clean in self.curse_words:
-            return True
+        if replacement_char is None:
+            replacement_char = self.replacement_char
+        elif len(replacement_char) != 1:
+            raise ValueError("Replacement character must be exactly one character")
         
-        # Check variations based on filter level
-        if self.filter_level in [FilterLevel.STRICT, FilterLevel.MODERATE]:
-            return self._detect_variations(word)
+        # One combined check on the valid path, the specific error is built on failure
+        if not message or not self.min_message_length <= len(message) <= self.max_message_length:
+            raise self._message_error(message)
         
-        return False
+        result = self._scan(message, level, replacement_char, preserve_length)
+        self.total_messages_processed += 1
+        self.total_words_filtered += result[3]
+        return result
+    
+    def _message_error(self, message: str) -> ValueError:
+        """Build the validation error for a message rejected by _process"""
+        if not message:
+            return ValueError("Message must be a non-empty string")
+        if len(message) > self.max_message_length:
+            return ValueError(f"Message too long (max {self.max_message_length} characters)")
+        return ValueError(f"Message too short (min {self.min_message_length} character)")
     
     def detect_inappropriate_words(self, message: str) -> List[str]:
         """
@@ -193,74 +709,49 @@ class ChatMessageFilter:
         Returns:
             List of inappropriate words found
         """
-        if not message or not isinstance(message, str):
+        if not message:
             return []
         
-        words = re.findall(r'\b\w+\b', message)
-        inappropriate_words = []
-        
-        print(f"🔍 DEBUG: Checking message words: {words}")
-        print(f"🔍 DEBUG: Against curse words: {self.curse_words}")
-        
-        for word in words:
-            print(f"   Checking '{word}' -> normalized: '{self._normalize_word(word)}' -> in list: {self._should_filter_word(word)}")
-            if self._should_filter_word(word):
-                inappropriate_words.append(word)
-        
-        print(f"🔍 DEBUG: Found inappropriate: {inappropriate_words}")
-        return inappropriate_words
+        return self._scan(message, self.filter_level, self.replacement_char)[1]
     
-    def filter_message(self, message: str, preserve_length: bool = True) -> str:
+    def filter_message(self, message: str, preserve_length: bool = True,
+                       level: Optional[FilterLevel] = None,
+                       replacement_char: Optional[str] = None) -> str:
         """
         Filter inappropriate words from a message.
         
         Args:
             message: The message to filter
             preserve_length: Whether to preserve original word length
+            level: Filter level for this call only (defaults to filter_level)
+            replacement_char: Replacement character for this call only
+                (defaults to replacement_char)
             
         Returns:
             Filtered message
         """
-        if not message or not isinstance(message, str):
-            raise ValueError("Message must be a non-empty string")
-        
-        if len(message) > self.max_message_length:
-            raise ValueError(f"Message too long (max {self.max_message_length} characters)")
-        
-        if len(message) < self.min_message_length:
-            raise ValueError(f"Message too short (min {self.min_message_length} character)")
-        
-        self.total_messages_processed += 1
-        filtered_count = 0
-        
-        def replace_word(match):
-            nonlocal filtered_count
-            word = match.group()
-            if self._should_filter_word(word):
-                filtered_count += 1
-                if preserve_length:
-                    return self.replacement_char * len(word)
-                else:
-                    return self.replacement_char * 3
-            return word
-        
-        # Use regex to find and replace words
-        filtered_message = re.sub(r'\b\w+\b', replace_word, message)
-        self.total_words_filtered += filtered_count
-        
-        return filtered_message
+        return self._process(message, preserve_length, level, replacement_char)[0]
     
-    def get_filter_report(self, message: str) -> Dict:
+    def get_filter_report(self, message: str, level: Optional[FilterLevel] = None,
+                          replacement_char: Optional[str] = None) -> Dict:
         """
         Generate a detailed report about filtering applied to a message.
         
         Args:
             message: The message to analyze
+            level: Filter level for this call only (defaults to filter_level)
+            replacement_char: Replacement character for this call only
+                (defaults to replacement_char)
             
         Returns:
             Dictionary containing filtering statistics
         """
-        if not message or not isinstance(message, str):
+        if level is None:
+            level = self.filter_level
+        elif level not in _LEVEL_TABLES:
+            raise ValueError("Level must be a FilterLevel enum")
+        
+        if not message:
             return {
                 'original_message': '',
                 'filtered_message': '',
@@ -268,21 +759,20 @@ class ChatMessageFilter:
                 'total_words': 0,
                 'filtered_words_count': 0,
                 'is_clean': True,
-                'filter_level': self.filter_level.value
+                'filter_level': level.value
             }
         
-        inappropriate_words = self.detect_inappropriate_words(message)
-        filtered_message = self.filter_message(message)
-        total_words = len(re.findall(r'\b\w+\b', message))
+        filtered_message, inappropriate_words, total_words, filtered_count = self._process(
+            message, level=level, replacement_char=replacement_char)
         
         return {
             'original_message': message,
             'filtered_message': filtered_message,
             'inappropriate_words': inappropriate_words,
             'total_words': total_words,
-            'filtered_words_count': len(inappropriate_words),
-            'is_clean': len(inappropriate_words) == 0,
-            'filter_level': self.filter_level.value,
+            'filtered_words_count': filtered_count,
+            'is_clean': filtered_count == 0,
+            'filter_level': level.value,
             'message_length': len(message)
         }
     
@@ -296,7 +786,10 @@ class ChatMessageFilter:
         Returns:
             True if message is clean, False otherwise
         """
-        return len(self.detect_inappropriate_words(message)) == 0
+        if not message:
+            return True
+        
+        return not self._has_any_bad_word(message)
     
     def get_statistics(self) -> Dict:
         """Get filtering statistics"""
@@ -308,6 +801,31 @@ class ChatMessageFilter:
             'replacement_character': self.replacement_char
         }
     
+    def get_sorted_curse_words(self) -> List[str]:
+        """
+        Get the curse words in sorted order.
+        
+        The list is cached until the curse words change and must not be modified.
+        """
+        return self.get_versioned_curse_words()[1]
+    
+    def get_versioned_curse_words(self) -> Tuple[int, List[str]]:
+        """
+        Get the sorted curse words together with the version they belong to.
+        
+        The version is read before the word snapshot, and the snapshot is
+        replaced before the version is bumped, so a list is never paired with
+        a newer version than its own. The list must not be modified.
+        """
+        version = self.curse_words_version
+        cached = self._sorted_curse_words
+        if cached is not None and cached[0] == version:
+            return cached
+        
+        cached = (version, sorted(self._curse_frozen))
+        self._sorted_curse_words = cached
+        return cached
+    
     def reset_statistics(self) -> None:
         """Reset filtering statistics"""
         self.total_messages_processed = 0
@@ -316,8 +834,13 @@ class ChatMessageFilter:
     def export_curse_words(self, file_path: str) -> None:
         """Export current curse words to a JSON file"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(sorted(list(self.curse_words)), file, indent=2)
+            words = self.get_sorted_curse_words()
+            if orjson is not None:
+                with open(file_path, 'wb') as file:
+                    file.write(orjson.dumps(words, option=orjson.OPT_INDENT_2))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as file:
+                    json.dump(words, file, indent=2)
         except Exception as e:
             raise IOError(f"Failed to export curse words: {e}")
     
@@ -334,7 +857,63 @@ class ChatMessageFilter:
         if not isinstance(messages, list):
             raise ValueError("Messages must be a list")
         
-        return [self.filter_message(msg) if isinstance(msg, str) else "" 
+        workers = os.cpu_count() or 1
+        if len(messages) <= _PARALLEL_BATCH_THRESHOLD or workers < 2:
+            return self._filter_batch_joined(messages)
+        
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers,
+                                             mp_context=_POOL_CONTEXT,
+                                             initializer=_init_batch_worker,
+                                             initargs=(self,))
+        
+        chunk_size = -(-len(messages) // workers)
+        chunks = [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+        settings = (self.filter_level, self.replacement_char,
+                    self.max_message_length, self.min_message_length)
+        
+        filtered_messages = []
+        for filtered, processed, words_filtered in self._pool.map(
+                _filter_batch_chunk, chunks, [settings] * len(chunks)):
+            filtered_messages.extend(filtered)
+            self.total_messages_processed += processed
+            self.total_words_filtered += words_filtered
+        
+        return filtered_messages
+    
+    def _filter_batch_joined(self, messages: List[str]) -> List[str]:
+        """
+        Filter a batch with a single automaton scan over the words of all messages.
+        
+        Word matches are mapped back to their message through the cumulative
+        word counts. Batches containing a message that fails validation are
+        filtered one message at a time so the same error is raised.
+        """
+        texts = [msg for msg in messages if isinstance(msg, str)]
+        if not all(msg and self.min_message_length <= len(msg) <= self.max_message_length
+                   for msg in texts):
+            return [self.filter_message(msg) if isinstance(msg, str) else ""
+                    for msg in messages]
+        
+        parts_list = [_WORD_RE.split(msg) for msg in texts]
+        words = [word for parts in parts_list for word in parts[1::2]]
+        word_ends = list(itertools.accumulate(len(parts) // 2 for parts in parts_list))
+        
+        matches = set(self._iter_matches(words, self.filter_level))
+        stars = self._replacement_strings(self.replacement_char)
+        for index in matches:
+            position = bisect.bisect_right(word_ends, index)
+            local = index - (word_ends[position - 1] if position else 0)
+            parts = parts_list[position]
+            length = len(words[index])
+            parts[2 * local + 1] = (stars[length] if length < len(stars)
+                                    else self.replacement_char * length)
+        
+        self.total_messages_processed += len(texts)
+        self.total_words_filtered += len(matches)
+        
+        filtered = iter(parts_list)
+        return [''.join(next(filtered)) if isinstance(msg, str) else ""
                 for msg in messages]
     
     def get_word_severity(self, word: str) -> str:
@@ -347,11 +926,35 @@ class ChatMessageFilter:
         Returns:
             Severity level as string
         """
-        if self._should_filter_word(word):
+        if self._should_filter_word_cached(word, self.filter_level, self.curse_words_version):
             return "offensive"
         return "clean"
 
 
+# Filter instance of a batch pool worker process
+_batch_worker_filter: Optional[ChatMessageFilter] = None
+
+
+def _init_batch_worker(filter_obj: ChatMessageFilter) -> None:
+    """Process pool initializer, keeps the parent's filter for the worker's lifetime"""
+    global _batch_worker_filter
+    _batch_worker_filter = filter_obj
+
+
+def _filter_batch_chunk(messages: List[str], settings: Tuple) -> Tuple[List[str], int, int]:
+    """Filter a chunk of a batch in a pool worker, returns the statistics deltas"""
+    filter_level, replacement_char, max_message_length, min_message_length = settings
+    worker = _batch_worker_filter
+    worker.set_filter_level(filter_level)
+    worker.set_replacement_char(replacement_char)
+    worker.max_message_length = max_message_length
+    worker.min_message_length = min_message_length
+    worker.reset_statistics()
+    
+    filtered = worker._filter_batch_joined(messages)
+    return filtered, worker.total_messages_processed, worker.total_words_filtered
+
+
 def create_sample_curse_words_file(filename: str = "curse_words.json") -> None:
     """Create a sample curse words JSON file for testing"""
     # DO NOT create default English words
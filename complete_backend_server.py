@@ -3,10 +3,18 @@
 Complete Python Backend Server for Chat Message Filter
 Works with the existing HTML demo page to provide full functionality
 Run this to get a fully functional web-based chat filter system
+
+For production, serve it with gunicorn instead of the development server:
+    gunicorn -c gunicorn.conf.py complete_backend_server:app
+
+The filter, its statistics and the curse word ETags live in process memory,
+so run a single worker process (threads are fine). With several workers,
+word list changes and statistics would be split between processes.
 """
 
-from flask import Flask, request, jsonify, send_from_directory, render_template_string
+from flask import Flask, Response, request, jsonify, send_from_directory, render_template_string
 import json
+import logging
 import os
 import sys
 import webbrowser
@@ -14,6 +22,16 @@ import threading
 import time
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # Import our chat filter module
 try:
     from chat_filter import ChatMessageFilter, FilterLevel, create_sample_curse_words_file
@@ -23,9 +41,103 @@ except ImportError:
 
 app = Flask(__name__)
 
+# Gzip responses above 1 KiB, mostly large /api/batch_filter results
+app.config['COMPRESS_MIN_SIZE'] = 1024
+if Compress is not None:
+    Compress(app)
+
+logger = logging.getLogger(__name__)
+
 # Global filter instance
 filter_instance = None
 
+# Distinguishes curse word ETags of this process from earlier runs
+_ETAG_PREFIX = f"{os.getpid()}-{int(time.time())}"
+
+# Predefined test examples for demonstration, serialized once at startup
+TEST_EXAMPLES = [
+    {
+        'category': 'Clean Messages',
+        'messages': [
+            "Hello world! How are you today?",
+            "This is a beautiful sunny day ☀️",
+            "I love programming and coding!",
+            "Let's have a great conversation",
+            "Technology is amazing these days"
+        ]
+    },
+    {
+        'category': 'Basic Profanity',
+        'messages': [
+            "You are so damn stupid!",
+            "This is a hell of a problem",
+            "That's just crap, honestly",
+            "Don't be such an idiot",
+            "This situation really sucks"
+        ]
+    },
+    {
+        'category': 'Leetspeak & Variations',
+        'messages': [
+            "D4mn th1s 1s b4d",
+            "What the h3ll is this?",
+            "5tup1d k1d5 th353 d4y5",
+            "Th@t'5 ju5t cr@p",
+            "D0n't b3 4n 1d10t"
+        ]
+    },
+    {
+        'category': 'Mixed Content',
+        'messages': [
+            "This is a damn good movie, honestly",
+            "Hell yeah, that's awesome! 🎉",
+            "Some clean words and some stupid dirty ones",
+            "What a beautiful day, damn right!",
+            "That's pretty cool, not gonna lie"
+        ]
+    }
+]
+
+_TEST_EXAMPLES_BODY = json.dumps({
+    'examples': TEST_EXAMPLES,
+    'total_categories': len(TEST_EXAMPLES),
+    'generated_at': datetime.now().isoformat()
+})
+
+# (second, ISO string) of the last formatted timestamp
+_timestamp_cache = (0, '')
+
+def iso_timestamp() -> str:
+    """Current local time in ISO format, formatted at most once per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _timestamp_cache[1]
+
+def json_response(payload: dict) -> Response:
+    """Serialize a response payload with orjson when available"""
+    if orjson is None:
+        return jsonify(payload)
+    try:
+        return Response(orjson.dumps(payload), mimetype='application/json')
+    except orjson.JSONEncodeError:
+        # Echoed client values orjson rejects, e.g. integers beyond 64 bits
+        return jsonify(payload)
+
+LEVEL_MAP = {
+    'strict': FilterLevel.STRICT,
+    'moderate': FilterLevel.MODERATE,
+    'lenient': FilterLevel.LENIENT
+}
+
+def _request_settings(filter_level, replacement_char):
+    """Map request settings to filter arguments, None keeps the filter's default"""
+    level = LEVEL_MAP.get(filter_level) if isinstance(filter_level, str) else None
+    if not (isinstance(replacement_char, str) and len(replacement_char) == 1):
+        replacement_char = None
+    return level, replacement_char
+
 def initialize_filter():
     """Initialize the chat filter with sample data"""
     global filter_instance
@@ -59,50 +171,40 @@ def filter_message_api():
     """API endpoint to filter a message"""
     try:
         data = request.get_json()
-        print(f"📥 Received data: {data}")  # Debug
+        logger.debug("Received data: %s", data)
         
         if not data or 'message' not in data:
             return jsonify({'error': 'Message is required'}), 400
         
         message = data['message']
+        if not isinstance(message, str):
+            return jsonify({'error': 'Message must be a string'}), 400
+        
         filter_level = data.get('filter_level', 'moderate')
         replacement_char = data.get('replacement_char', '*')
-        preserve_length = data.get('preserve_length', True)
+        preserve_length = bool(data.get('preserve_length', True))
         
-        print(f"🔍 Filtering message: '{message}' with level: {filter_level}")  # Debug
-        
-        # Set filter level
-        level_map = {
-            'strict': FilterLevel.STRICT,
-            'moderate': FilterLevel.MODERATE,
-            'lenient': FilterLevel.LENIENT
-        }
+        logger.debug("Filtering message: %r with level: %s", message, filter_level)
         
-        if filter_level in level_map:
-            filter_instance.set_filter_level(level_map[filter_level])
-        
-        # Set replacement character
-        if replacement_char and len(replacement_char) == 1:
-            filter_instance.set_replacement_char(replacement_char)
+        # Settings only apply to this request, the shared filter is not modified
+        level, char = _request_settings(filter_level, replacement_char)
         
         # Get comprehensive report
-        report = filter_instance.get_filter_report(message)
-        print(f"📤 Sending response: {report}")  # Debug
+        report = filter_instance.get_filter_report(message, level=level, replacement_char=char)
+        logger.debug("Sending response: %s", report)
         
         # Add additional processing info
-        report['processing_time'] = datetime.now().isoformat()
+        report['processing_time'] = iso_timestamp()
         report['filter_settings'] = {
             'level': filter_level,
             'replacement_char': replacement_char,
             'preserve_length': preserve_length
         }
         
-        return jsonify(report)
+        return json_response(report)
         
     except Exception as e:
-        print(f"❌ Error in filter_message_api: {str(e)}")  # Debug
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in filter_message_api")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/batch_filter', methods=['POST'])
@@ -121,24 +223,13 @@ def batch_filter_api():
         filter_level = data.get('filter_level', 'moderate')
         replacement_char = data.get('replacement_char', '*')
         
-        # Set filter settings
-        level_map = {
-            'strict': FilterLevel.STRICT,
-            'moderate': FilterLevel.MODERATE,
-            'lenient': FilterLevel.LENIENT
-        }
-        
-        if filter_level in level_map:
-            filter_instance.set_filter_level(level_map[filter_level])
-        
-        if replacement_char and len(replacement_char) == 1:
-            filter_instance.set_replacement_char(replacement_char)
+        level, char = _request_settings(filter_level, replacement_char)
         
         # Process all messages
         results = []
         for i, message in enumerate(messages):
             if isinstance(message, str):
-                report = filter_instance.get_filter_report(message)
+                report = filter_instance.get_filter_report(message, level=level, replacement_char=char)
                 report['message_index'] = i
                 results.append(report)
             else:
@@ -150,10 +241,10 @@ def batch_filter_api():
                     'is_clean': False
                 })
         
-        return jsonify({
+        return json_response({
             'results': results,
             'total_processed': len(results),
-            'processing_time': datetime.now().isoformat()
+            'processing_time': iso_timestamp()
         })
         
     except Exception as e:
@@ -173,12 +264,17 @@ def get_statistics():
 def get_curse_words():
     """Get list of curse words"""
     try:
-        words = sorted(list(filter_instance.curse_words))
-        return jsonify({
+        version, words = filter_instance.get_versioned_curse_words()
+        response = jsonify({
             'words': words,
             'count': len(words),
             'timestamp': datetime.now().isoformat()
         })
+        
+        # Clients revalidate every time, unchanged lists are answered with 304
+        response.set_etag(f"{_ETAG_PREFIX}-{version}", weak=True)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -237,7 +333,7 @@ def reset_statistics():
 def export_words():
     """Export curse words as JSON"""
     try:
-        words = sorted(list(filter_instance.curse_words))
+        words = filter_instance.get_sorted_curse_words()
         return jsonify({
             'words': words,
             'count': len(words),
@@ -249,54 +345,10 @@ def export_words():
 @app.route('/api/test_examples', methods=['GET'])
 def get_test_examples():
     """Get predefined test examples for demonstration"""
-    examples = [
-        {
-            'category': 'Clean Messages',
-            'messages': [
-                "Hello world! How are you today?",
-                "This is a beautiful sunny day ☀️",
-                "I love programming and coding!",
-                "Let's have a great conversation",
-                "Technology is amazing these days"
-            ]
-        },
-        {
-            'category': 'Basic Profanity',
-            'messages': [
-                "You are so damn stupid!",
-                "This is a hell of a problem",
-                "That's just crap, honestly",
-                "Don't be such an idiot",
-                "This situation really sucks"
-            ]
-        },
-        {
-            'category': 'Leetspeak & Variations',
-            'messages': [
-                "D4mn th1s 1s b4d",
-                "What the h3ll is this?",
-                "5tup1d k1d5 th353 d4y5",
-                "Th@t'5 ju5t cr@p",
-                "D0n't b3 4n 1d10t"
-            ]
-        },
-        {
-            'category': 'Mixed Content',
-            'messages': [
-                "This is a damn good movie, honestly",
-                "Hell yeah, that's awesome! 🎉",
-                "Some clean words and some stupid dirty ones",
-                "What a beautiful day, damn right!",
-                "That's pretty cool, not gonna lie"
-            ]
-        }
-    ]
-    
-    return jsonify({
-        'examples': examples,
-        'total_categories': len(examples),
-        'generated_at': datetime.now().isoformat()
-    })
+    response = Response(_TEST_EXAMPLES_BODY, mimetype='application/json')
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -322,6 +374,8 @@ def open_browser():
 def run_server(host='localhost', port=5000, debug=False, open_browser_tab=True):
     """Run the Flask server"""
     
+    logging.basicConfig(level=logging.DEBUG if debug else logging.WARNING)
+    
     print("🚀 Starting Chat Message Filter Web Server")
     print("=" * 50)
     
@@ -345,6 +399,7 @@ def run_server(host='localhost', port=5000, debug=False, open_browser_tab=True):
     
     print(f"\n✅ Server ready! Visit http://{host}:{port} to use the chat filter")
     print("🛑 Press Ctrl+C to stop the server")
+    print("💡 For production use: gunicorn -c gunicorn.conf.py complete_backend_server:app")
     print("=" * 50)
     
     try:
@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for the Chat Message Filter server
+Usage: gunicorn -c gunicorn.conf.py complete_backend_server:app
+
+The server keeps its curse word list, statistics and ETags in process
+memory, so it must run as a single worker process. More workers would each
+hold their own copy: word list changes and statistics resets would only
+reach the worker that handled the request. Concurrency comes from threads.
+"""
+
+bind = "0.0.0.0:5000"
+workers = 1
+worker_class = "gthread"
+threads = 4
+
+
+def post_fork(server, worker):
+    """Load the curse words in the worker process"""
+    import complete_backend_server
+    complete_backend_server.initialize_filter()
@@ -6,29 +6,24 @@ Minimum 15 test cases as required by the project.
 
 import pytest
 import json
+import marshal
 import os
-import tempfile
+import chat_filter
 from chat_filter import ChatMessageFilter, FilterLevel
 
 
 class TestChatMessageFilter:
     """Test class for ChatMessageFilter functionality"""
     
-    @pytest.fixture
-    def temp_curse_words_file(self):
-        """Create a temporary curse words file for testing"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-            test_words = {
-                "curse": ["blyat", "suka", "enangnikiga", "qanju", "iflos"]
-            }
-            json.dump(test_words, f, ensure_ascii=False)
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
+    @pytest.fixture(scope="session")
+    def temp_curse_words_file(self, tmp_path_factory):
+        """Create a temporary curse words file shared by all tests, which must not modify it"""
+        path = tmp_path_factory.mktemp("chat_filter") / "curse_words.json"
+        test_words = {
+            "curse": ["blyat", "suka", "enangnikiga", "qanju", "iflos"]
+        }
+        path.write_text(json.dumps(test_words, ensure_ascii=False), encoding='utf-8')
+        return str(path)
     
     @pytest.fixture
     def filter_instance(self, temp_curse_words_file):
@@ -45,6 +40,72 @@ class TestChatMessageFilter:
         assert "blyat" in filter_obj.curse_words
         assert filter_obj.filter_level == FilterLevel.MODERATE
     
+    @pytest.mark.positive
+    def test_initialization_uses_word_cache(self, tmp_path, monkeypatch):
+        """Test the cached word list is written, reused and refreshed on change"""
+        path = tmp_path / "curse_words.json"
+        path.write_text(json.dumps(["blyat", "suka"]), encoding='utf-8')
+        
+        ChatMessageFilter(str(path))
+        assert os.path.exists(str(path) + ".cache.marshal")
+        
+        # A new process: nothing cached in memory and the JSON must not be parsed
+        def failing_loads(raw):
+            raise AssertionError("JSON parsed despite a valid cache")
+        
+        ChatMessageFilter._load_state.cache_clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(chat_filter, "orjson", None)
+            patch.setattr(json, "loads", failing_loads)
+            assert ChatMessageFilter(str(path)).curse_words == {"blyat", "suka"}
+        
+        path.write_text(json.dumps({"curse": ["yangi", "soz", "gap"]}), encoding='utf-8')
+        assert ChatMessageFilter(str(path)).curse_words == {"yangi", "soz", "gap"}
+    
+    @pytest.mark.negative
+    def test_empty_word_cache_is_rejected(self, tmp_path):
+        """Test that a cache holding no words raises like an empty curse words file"""
+        path = tmp_path / "curse_words.json"
+        path.write_text(json.dumps(["blyat"]), encoding='utf-8')
+        stat = os.stat(path)
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        with open(str(path) + ".cache.marshal", 'wb') as f:
+            marshal.dump((cache_key, []), f)
+        
+        with pytest.raises(ValueError, match="No curse words found"):
+            ChatMessageFilter._load_state(str(path), cache_key)
+    
+    @pytest.mark.negative
+    def test_malformed_word_cache_is_ignored(self, tmp_path, monkeypatch):
+        """Test that a tampered cache falls back to the JSON file and failed writes leave no temp file"""
+        path = tmp_path / "curse_words.json"
+        path.write_text(json.dumps(["blyat", "suka"]), encoding='utf-8')
+        stat = os.stat(path)
+        with open(str(path) + ".cache.marshal", 'wb') as f:
+            f.write(b"\x80\x04not marshal data")
+        
+        def failing_replace(src, dst):
+            raise OSError("read-only directory")
+        
+        monkeypatch.setattr(os, "replace", failing_replace)
+        assert chat_filter._read_word_cache(str(path) + ".cache.marshal",
+                                            (stat.st_mtime_ns, stat.st_size)) is None
+        assert ChatMessageFilter(str(path)).curse_words == {"blyat", "suka"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["curse_words.json",
+                                                              "curse_words.json.cache.marshal"]
+    
+    @pytest.mark.positive
+    def test_instances_share_loaded_state(self, temp_curse_words_file):
+        """Test filters for the same file share the automaton until one changes"""
+        first = ChatMessageFilter(temp_curse_words_file)
+        second = ChatMessageFilter(temp_curse_words_file)
+        assert first._get_automaton() is second._get_automaton()
+        
+        first.add_curse_word("yomon")
+        assert first._get_automaton() is not second._get_automaton()
+        assert "yomon" not in second.curse_words
+        assert second.filter_message("Salom yomon kun") == "Salom yomon kun"
+    
     @pytest.mark.positive
     def test_add_curse_word_success(self, filter_instance):
         """Test successfully adding a new curse word"""
@@ -65,6 +126,65 @@ class TestChatMessageFilter:
         assert len(filter_instance.curse_words) == initial_count - 1
         assert "blyat" not in filter_instance.curse_words
     
+    @pytest.mark.positive
+    def test_word_list_changes_apply_to_repeated_messages(self, filter_instance):
+        """Test that adding and removing words affects already seen messages"""
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom yomon kun"
+        
+        filter_instance.add_curse_word("yomon")
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom ***** kun"
+        
+        filter_instance.remove_curse_word("yomon")
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom yomon kun"
+    
+    @pytest.mark.positive
+    def test_word_list_change_during_scan_is_not_cached(self, filter_instance, monkeypatch):
+        """Test that a scan racing with a word list change does not leave a stale result"""
+        original = filter_instance._iter_joined_matches
+        
+        def racing_match(joined, level):
+            result = list(original(joined, level))
+            filter_instance.add_curse_word("yomon")
+            return iter(result)
+        
+        monkeypatch.setattr(filter_instance, "_iter_joined_matches", racing_match)
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom yomon kun"
+        
+        monkeypatch.undo()
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom ***** kun"
+    
+    @pytest.mark.positive
+    def test_word_list_change_during_automaton_build(self, filter_instance, monkeypatch):
+        """Test that an automaton built from an outdated word list gets rebuilt"""
+        original = chat_filter._build_automaton
+        
+        def racing_build(words, factory):
+            automaton = original(words, factory)
+            filter_instance.add_curse_word("yomon")
+            return automaton
+        
+        monkeypatch.setattr(chat_filter, "_build_automaton", racing_build)
+        filter_instance._get_automaton()
+        
+        monkeypatch.undo()
+        assert filter_instance.filter_message("Salom yomon kun") == "Salom ***** kun"
+    
+    @pytest.mark.positive
+    def test_word_list_change_during_sort(self, filter_instance, monkeypatch):
+        """Test that a sorted list built from an outdated word list is not reused"""
+        def racing_sorted(words):
+            result = sorted(words)
+            filter_instance.add_curse_word("yomon")
+            return result
+        
+        monkeypatch.setattr(chat_filter, "sorted", racing_sorted, raising=False)
+        assert "yomon" not in filter_instance.get_sorted_curse_words()
+        
+        monkeypatch.undo()
+        version, words = filter_instance.get_versioned_curse_words()
+        assert version == filter_instance.curse_words_version
+        assert "yomon" in words
+    
     @pytest.mark.positive
     def test_set_replacement_char_valid(self, filter_instance):
         """Test setting valid replacement character"""
@@ -140,6 +260,99 @@ class TestChatMessageFilter:
         assert filtered_messages[0] == messages[0]
         assert "****" in filtered_messages[1] or "*****" in filtered_messages[1]
     
+    @pytest.mark.positive
+    def test_leet_speak_variations(self, filter_instance):
+        """Test detecting leet speak and character substitution variations"""
+        message = "5uka 1flo5 qanjy blyat"
+        assert filter_instance.detect_inappropriate_words(message) == ["5uka", "1flo5", "qanjy", "blyat"]
+        assert filter_instance.get_word_severity("$uka") == "offensive"
+        
+        filter_instance.set_filter_level(FilterLevel.LENIENT)
+        assert filter_instance.detect_inappropriate_words(message) == ["blyat"]
+        assert filter_instance.get_word_severity("$uka") == "clean"
+    
+    @pytest.mark.positive
+    def test_leet_normalization_disabled(self, temp_curse_words_file):
+        """Test that leet speak is only matched when normalize_leet is enabled"""
+        filter_obj = ChatMessageFilter(temp_curse_words_file, normalize_leet=False)
+        
+        assert filter_obj.detect_inappropriate_words("5uka 1flo5 blyat") == ["blyat"]
+        assert filter_obj.get_word_severity("$uka") == "clean"
+    
+    @pytest.mark.boundary
+    def test_normalization_tables_stay_bounded(self, filter_instance):
+        """Test that unusual characters do not grow the shared normalization tables"""
+        filter_instance.is_message_clean("Привет мир")
+        sizes = (len(chat_filter._STRICT_TABLE), len(chat_filter._LEET_TABLE))
+        
+        message = "".join(chr(code) for code in range(0x4E00, 0x4E00 + 900))
+        assert filter_instance.is_message_clean(message)
+        assert (len(chat_filter._STRICT_TABLE), len(chat_filter._LEET_TABLE)) == sizes
+    
+    @pytest.mark.boundary
+    def test_word_severity_ignores_surrounding_whitespace(self, filter_instance):
+        """Test that spaces and punctuation around a single word are ignored"""
+        assert filter_instance.get_word_severity("blyat ") == "offensive"
+        assert filter_instance.get_word_severity(" blyat, ") == "offensive"
+        assert filter_instance.get_word_severity("bl yat") == "offensive"
+        assert filter_instance.get_word_severity("salom ") == "clean"
+    
+    @pytest.mark.positive
+    def test_filter_message_per_call_settings(self, filter_instance):
+        """Test per-call level and replacement character leave the filter unchanged"""
+        assert filter_instance.filter_message("Bu 5uka gap", level=FilterLevel.LENIENT) == "Bu 5uka gap"
+        assert filter_instance.filter_message("Bu 5uka gap", replacement_char="#") == "Bu #### gap"
+        
+        report = filter_instance.get_filter_report("Bu 5uka gap", level=FilterLevel.LENIENT)
+        assert report['is_clean']
+        assert report['filter_level'] == "lenient"
+        
+        assert filter_instance.filter_level == FilterLevel.MODERATE
+        assert filter_instance.replacement_char == "*"
+    
+    @pytest.mark.positive
+    def test_batch_filter_messages_large(self, filter_instance, monkeypatch):
+        """Test filtering a batch big enough to use the process pool"""
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(chat_filter, "_PARALLEL_BATCH_THRESHOLD", 32)
+        messages = ["Salom dunyo!", "Sen blyat suka sen!", 42, "Bu 5uka gap"] * 20
+        filter_instance.set_replacement_char("#")
+        
+        try:
+            filtered_messages = filter_instance.batch_filter_messages(messages)
+            assert filter_instance._pool is not None
+        finally:
+            # Worker processes must not outlive the test
+            if filter_instance._pool is not None:
+                filter_instance._pool.shutdown()
+                filter_instance._pool = None
+        
+        assert filtered_messages == ["Salom dunyo!", "Sen ##### #### sen!", "", "Bu #### gap"] * 20
+        stats = filter_instance.get_statistics()
+        assert stats['total_messages_processed'] == 60
+        assert stats['total_words_filtered'] == 60
+    
+    @pytest.mark.positive
+    def test_pure_python_automaton_fallback(self, temp_curse_words_file, monkeypatch):
+        """Test filtering without pyahocorasick installed"""
+        monkeypatch.setattr(chat_filter, "ahocorasick", None)
+        filter_obj = ChatMessageFilter(temp_curse_words_file)
+        
+        assert filter_obj.filter_message("Salom suka blyat qalesan!") == "Salom **** ***** qalesan!"
+        assert filter_obj.detect_inappropriate_words("5uka sukablyat bl4yat") == ["5uka", "bl4yat"]
+        assert filter_obj.is_message_clean("Salom dunyo!")
+    
+    @pytest.mark.positive
+    def test_pure_python_trie_fallback(self, temp_curse_words_file, monkeypatch):
+        """Test filtering with the trie used for word lists too big for a regex"""
+        monkeypatch.setattr(chat_filter, "ahocorasick", None)
+        monkeypatch.setattr(chat_filter, "_ALTERNATION_MAX_WORDS", 0)
+        filter_obj = ChatMessageFilter(temp_curse_words_file)
+        
+        assert filter_obj.filter_message("Salom suka blyat qalesan!") == "Salom **** ***** qalesan!"
+        assert filter_obj.detect_inappropriate_words("5uka sukablyat bl4yat") == ["5uka", "bl4yat"]
+        assert isinstance(filter_obj._get_automaton(), chat_filter._Trie)
+    
     # NEGATIVE TESTS (invalid input → error handling)
     
     @pytest.mark.negative
@@ -175,6 +388,15 @@ class TestChatMessageFilter:
         with pytest.raises(ValueError):
             filter_instance.filter_message(None)
     
+    @pytest.mark.negative
+    def test_get_filter_report_invalid_level(self, filter_instance):
+        """Test that an invalid per-call level raises the same error for any message"""
+        with pytest.raises(ValueError):
+            filter_instance.get_filter_report("", level="strict")
+        
+        with pytest.raises(ValueError):
+            filter_instance.get_filter_report("Salom dunyo", level="strict")
+    
     @pytest.mark.negative
     def test_batch_filter_messages_invalid_input(self, filter_instance):
         """Test batch filtering with invalid input"""